@@ -0,0 +1,162 @@
+import json
+import shutil
+import tempfile
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from messages_manipulator import MessagesManipulator
+
+
+class AnalysisBundle:
+    """
+    Save cleaned messages as a binary bundle and load them back zero-copy.
+    The bundle is a dir with the next files:
+
+    vocab.json         - list of unique clean words, token id is the position in this list
+    users.json         - list of unique users, user code is the position in this list
+    token_ids.npy      - int32 token ids of all clean words of all messages (one after another)
+    token_offsets.npy  - int64 offsets, words of message i are token_ids[token_offsets[i]:token_offsets[i + 1]]
+    timestamps.npy     - int64 message local (wall clock) datetimes in ns
+    user_codes.npy     - int32 user code for every message
+    """
+    __VOCAB_FILE = 'vocab.json'
+    __USERS_FILE = 'users.json'
+    __TOKEN_IDS_FILE = 'token_ids.npy'
+    __TOKEN_OFFSETS_FILE = 'token_offsets.npy'
+    __TIMESTAMPS_FILE = 'timestamps.npy'
+    __USER_CODES_FILE = 'user_codes.npy'
+
+    @staticmethod
+    def save(messages_manipulator: MessagesManipulator, bundle_dir: Path) -> None:
+        """
+        Write the bundle to a temporary dir near bundle_dir, then move the previous bundle aside,
+        rename the new one into place and only after that remove the previous one.
+        So a failed save keeps the previous bundle and a partially written bundle is never in bundle_dir.
+
+        NOTE: Renames of two dirs are not atomic together: if the process is killed between them,
+              bundle_dir is missing and the previous bundle is left in the hidden .old dir near it.
+        """
+        if messages_manipulator.raw_messages is None:
+            raise ValueError('Could not save messages manipulator created by from_prepared() '
+                             '(e.g. loaded from analysis bundle) since it has no raw messages!')
+
+        prepared_messages = messages_manipulator.prepared_messages
+
+        clean_words: pd.Series = prepared_messages['clean_words']
+        token_offsets = np.zeros(len(clean_words) + 1, dtype=np.int64)
+        np.cumsum(clean_words.str.len().to_numpy(dtype=np.int64), out=token_offsets[1:])
+
+        token_ids, vocab = pd.factorize(list(chain.from_iterable(clean_words)))
+        user_codes, users = pd.factorize(prepared_messages['user'])
+        # NOTE: Telegram exports dates with UTC offset, but stats use local (wall clock) dates of messages,
+        #       so keep wall clock time instead of UTC one to get the same days, months & years after load.
+        datetimes: pd.Series = messages_manipulator.raw_messages['datetime']
+        if datetimes.dt.tz is not None:
+            datetimes = datetimes.dt.tz_localize(None)
+        timestamps = datetimes.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+        bundle_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_bundle_dir = Path(tempfile.mkdtemp(prefix=f'.{bundle_dir.name}.', dir=bundle_dir.parent))
+        try:
+            np.save(tmp_bundle_dir / AnalysisBundle.__TOKEN_IDS_FILE, token_ids.astype(np.int32))
+            np.save(tmp_bundle_dir / AnalysisBundle.__TOKEN_OFFSETS_FILE, token_offsets)
+            np.save(tmp_bundle_dir / AnalysisBundle.__TIMESTAMPS_FILE, timestamps)
+            np.save(tmp_bundle_dir / AnalysisBundle.__USER_CODES_FILE, user_codes.astype(np.int32))
+
+            with (tmp_bundle_dir / AnalysisBundle.__VOCAB_FILE).open('w') as vocab_file:
+                json.dump(vocab.tolist(), vocab_file, ensure_ascii=False)
+            with (tmp_bundle_dir / AnalysisBundle.__USERS_FILE).open('w') as users_file:
+                json.dump(users.tolist(), users_file, ensure_ascii=False)
+        except Exception:
+            shutil.rmtree(tmp_bundle_dir, ignore_errors=True)
+            raise
+
+        old_bundle_dir = tmp_bundle_dir.with_name(tmp_bundle_dir.name + '.old')
+        try:
+            if bundle_dir.exists():
+                bundle_dir.rename(old_bundle_dir)
+            tmp_bundle_dir.rename(bundle_dir)
+        except Exception:
+            if old_bundle_dir.exists():
+                old_bundle_dir.rename(bundle_dir)
+            shutil.rmtree(tmp_bundle_dir, ignore_errors=True)
+            raise
+
+        shutil.rmtree(old_bundle_dir, ignore_errors=True)
+
+    @staticmethod
+    def open_arrays(bundle_dir: Path) -> dict[str, np.memmap]:
+        """
+        Open bundle arrays as read-only np.memmap without reading them into memory.
+        Return dict with the next keys: [token_ids, token_offsets, timestamps, user_codes]
+        """
+        if not bundle_dir.is_dir():
+            raise ValueError(f'Path [{bundle_dir}] does not exist or it is not a dir!')
+
+        return {
+            'token_ids': np.load(bundle_dir / AnalysisBundle.__TOKEN_IDS_FILE, mmap_mode='r'),
+            'token_offsets': np.load(bundle_dir / AnalysisBundle.__TOKEN_OFFSETS_FILE, mmap_mode='r'),
+            'timestamps': np.load(bundle_dir / AnalysisBundle.__TIMESTAMPS_FILE, mmap_mode='r'),
+            'user_codes': np.load(bundle_dir / AnalysisBundle.__USER_CODES_FILE, mmap_mode='r'),
+        }
+
+    @staticmethod
+    def open_vocab(bundle_dir: Path) -> list[str]:
+        with (bundle_dir / AnalysisBundle.__VOCAB_FILE).open('r') as vocab_file:
+            return json.load(vocab_file)
+
+    @staticmethod
+    def open_users(bundle_dir: Path) -> list[str]:
+        with (bundle_dir / AnalysisBundle.__USERS_FILE).open('r') as users_file:
+            return json.load(users_file)
+
+    @staticmethod
+    def load(bundle_dir: Path,
+             messages_manipulator_class: type[MessagesManipulator] = MessagesManipulator) -> MessagesManipulator:
+        """
+        Rebuild MessagesManipulator (or its subclass, e.g. ArrowMessagesManipulator)
+        from the bundle without parsing and stemming again.
+
+        NOTE: Bundle does not keep original texts, so prepared messages have only
+              [date, month, year, user] cols and flatten messages have only
+              [date, user, clean_words] cols. Use saved .tsv if texts are needed.
+        """
+        arrays = AnalysisBundle.open_arrays(bundle_dir)
+        vocab = AnalysisBundle.open_vocab(bundle_dir)
+        users = AnalysisBundle.open_users(bundle_dir)
+
+        days = arrays['timestamps'].view('datetime64[ns]').astype('datetime64[D]')
+        dates = days.astype('datetime64[ns]')
+
+        # NOTE: Chat covers only some thousands of days, so calculate month & year once per day
+        #       and take them by day number. It is much faster than .dt accessors for 10M+ messages.
+        day_numbers = days.view(np.int64)
+        first_day_number = day_numbers.min()
+        calendar_months = np.arange(first_day_number, day_numbers.max() + 1) \
+            .astype('datetime64[D]') \
+            .astype('datetime64[M]') \
+            .astype(np.int64)
+        day_offsets = day_numbers - first_day_number
+
+        prepared_messages = pd.DataFrame({
+            'date': dates,
+            'month': (calendar_months % 12 + 1)[day_offsets],
+            'year': (calendar_months // 12 + 1970)[day_offsets],
+            'user': pd.Categorical.from_codes(arrays['user_codes'], users),
+        })
+
+        # NOTE: pandas groupby value_counts fails on categorical without categories,
+        #       so use empty words col like MessagesManipulator has when there are no clean words at all.
+        clean_words = pd.Categorical.from_codes(arrays['token_ids'], vocab) if vocab else np.array([], dtype=object)
+
+        message_indexes = np.repeat(np.arange(len(days)), np.diff(arrays['token_offsets']))
+        flatten_messages = pd.DataFrame({
+            'date': dates[message_indexes],
+            'user': pd.Categorical.from_codes(arrays['user_codes'][message_indexes], users),
+            'clean_words': clean_words,
+        }, index=pd.Index(message_indexes, name='index'))
+
+        return messages_manipulator_class.from_prepared(prepared_messages, flatten_messages)
@@ -0,0 +1,154 @@
+import pandas as pd
+import polars as pl
+
+from messages_manipulator import MessagesManipulator
+from words_stemmer import WordsStemmer
+
+
+class ArrowMessagesManipulator(MessagesManipulator):
+    """
+    MessagesManipulator which calculates the same stats with Polars lazy queries
+    over Arrow columns instead of pandas groupby chains.
+    Queries are optimized as a whole and run multithreaded (see POLARS_MAX_THREADS),
+    results are returned as pandas DataFrames with the same cols as MessagesManipulator ones
+    """
+
+    def __init__(self, raw_messages: pd.DataFrame, words_stemmer: WordsStemmer | None = None) -> None:
+        super().__init__(raw_messages, words_stemmer)
+        self.__init_frames()
+
+    @classmethod
+    def from_prepared(cls,
+                      prepared_messages: pd.DataFrame,
+                      flatten_messages: pd.DataFrame) -> 'ArrowMessagesManipulator':
+        messages_manipulator = super().from_prepared(prepared_messages, flatten_messages)
+        messages_manipulator.__init_frames()
+
+        return messages_manipulator
+
+    def __init_frames(self) -> None:
+        # NOTE: Convert only cols used in stats, [time, message, ...] are python objects
+        #       which would be copied for nothing.
+        prepared_messages = self.prepared_messages[['date', 'month', 'year', 'user']]
+        flatten_messages = self.flatten_messages[['user', 'clean_words']].reset_index()
+
+        self.__categories: dict[str, pd.Index] = {
+            column: messages[column].cat.categories
+            for messages in [prepared_messages, flatten_messages]
+            for column in messages.select_dtypes('category').columns
+        }
+        self.prepared_frame: pl.LazyFrame = self.__to_frame(prepared_messages)
+        self.flatten_frame: pl.LazyFrame = self.__to_frame(flatten_messages)
+
+    @staticmethod
+    def __to_frame(messages: pd.DataFrame) -> pl.LazyFrame:
+        """
+        Replace categorical cols (e.g. loaded from AnalysisBundle) by their codes,
+        so queries group & sort them in the same order as pandas does.
+        Drop messages without user (null or -1 code) since pandas groupby drops null keys
+        """
+        frame = pl.from_pandas(messages.assign(**{
+            column: messages[column].cat.codes for column in messages.select_dtypes('category').columns
+        })).lazy()
+
+        user = pl.col('user')
+        if isinstance(messages['user'].dtype, pd.CategoricalDtype):
+            return frame.filter(user >= 0)
+
+        return frame.filter(user.is_not_null())
+
+    def __collect(self, query: pl.LazyFrame) -> pd.DataFrame:
+        res = query.collect().to_pandas()
+        for column, categories in self.__categories.items():
+            if column in res:
+                res[column] = pd.Categorical.from_codes(res[column], categories)
+
+        return res
+
+    @staticmethod
+    def __count(name: str) -> pl.Expr:
+        return pl.len().cast(pl.Int64).alias(name)
+
+    @staticmethod
+    def __head(n: int, by: list[str]) -> pl.Expr:
+        """Keep first n rows of every group like pandas groupby().head(n) without changing rows order"""
+        return pl.int_range(0, pl.len()).over(by) < n
+
+    def get_popular_words(self, n: int) -> pd.DataFrame:
+        query = self.flatten_frame \
+            .group_by(['user', 'clean_words']) \
+            .agg(self.__count('count')) \
+            .sort(['user', 'count', 'clean_words'], descending=[False, True, False]) \
+            .filter(self.__head(n, ['user']))
+
+        return self.__collect(query).rename(columns={'clean_words': 'word'})
+
+    def get_message_count(self) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by('user') \
+            .agg(self.__count('count')) \
+            .sort('user')
+
+        return self.__collect(query)
+
+    def get_mean_message_len(self) -> pd.DataFrame:
+        # NOTE: Mean of words count per message is all words count / messages count,
+        #       so one group by user is enough instead of grouping by every message first.
+        query = self.flatten_frame \
+            .group_by('user') \
+            .agg((pl.col('clean_words').count() / pl.col('index').n_unique()).alias('words_in_avg_by_message')) \
+            .sort('user') \
+            .with_columns(pl.col('words_in_avg_by_message').ceil().alias('count'))  # round to upper
+
+        return self.__collect(query)
+
+    def get_mean_per_active_day(self) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by(['user', 'date']) \
+            .agg(self.__count('messages_count')) \
+            .group_by('user') \
+            .agg(pl.col('messages_count').mean().alias('messages_in_avg_per_day')) \
+            .sort('user') \
+            .with_columns(pl.col('messages_in_avg_per_day').ceil().alias('count'))  # round to upper
+
+        return self.__collect(query)
+
+    def get_total_per_active_day(self) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by(['user', 'date']) \
+            .agg(self.__count('messages_count')) \
+            .sort(['user', 'date'])
+
+        return self.__collect(query)
+
+    def get_mean_per_active_month(self) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by(['user', 'month', 'year']) \
+            .agg(self.__count('messages_count')) \
+            .group_by(['user', 'year']) \
+            .agg(pl.col('messages_count').mean().alias('messages_in_avg_per_month')) \
+            .sort(['user', 'year']) \
+            .with_columns(pl.col('messages_in_avg_per_month').ceil().alias('count'))  # round to upper
+
+        return self.__collect(query)
+
+    def get_mean_per_active_year(self) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by(['user', 'year']) \
+            .agg(self.__count('messages_count')) \
+            .group_by('user') \
+            .agg(pl.col('messages_count').mean().alias('messages_in_avg_per_year')) \
+            .sort('user') \
+            .with_columns(pl.col('messages_in_avg_per_year').ceil().alias('count'))  # round to upper
+
+        return self.__collect(query)
+
+    def get_active_months_per_active_year(self, n: int) -> pd.DataFrame:
+        query = self.prepared_frame \
+            .group_by(['user', 'month', 'year']) \
+            .agg(self.__count('messages_count')) \
+            .sort(['user', 'month', 'year']) \
+            .sort('messages_count', descending=True, maintain_order=True) \
+            .filter(self.__head(n, ['user', 'year']))
+
+        return self.__collect(query)
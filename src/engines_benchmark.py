@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Callable
+
+import coloredlogs
+import pandas as pd
+
+from analysis_bundle import AnalysisBundle
+from arrow_messages_manipulator import ArrowMessagesManipulator
+from messages_manipulator import MessagesManipulator
+from words_stemmer import WordsStemmer
+
+STATS: dict[str, Callable[[MessagesManipulator], pd.DataFrame]] = {
+    'get_popular_words': lambda m: m.get_popular_words(10),
+    'get_message_count': lambda m: m.get_message_count(),
+    'get_mean_message_len': lambda m: m.get_mean_message_len(),
+    'get_mean_per_active_day': lambda m: m.get_mean_per_active_day(),
+    'get_total_per_active_day': lambda m: m.get_total_per_active_day(),
+    'get_mean_per_active_month': lambda m: m.get_mean_per_active_month(),
+    'get_mean_per_active_year': lambda m: m.get_mean_per_active_year(),
+    'get_active_months_per_active_year': lambda m: m.get_active_months_per_active_year(10),
+}
+
+
+def benchmark(get_stats: Callable[[], pd.DataFrame], repeat: int) -> float:
+    """Return the best time of repeats in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_stats()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f'[write-me] Compare speed of stats engines')
+    parser.add_argument('--repeat', type=int, default=5, metavar='', help='count of runs for every stats')
+    source_args = parser.add_mutually_exclusive_group(required=True)
+    source_args.add_argument('-f', '--file', type=str, metavar='', help='.tsv with messages saved by main.py')
+    source_args.add_argument('-b', '--bundle', type=str, metavar='', help='.bundle dir saved by main.py')
+
+    args = parser.parse_args()
+
+    coloredlogs.install(logging.INFO)
+    logger = logging.getLogger("[write-me]")
+
+    if args.file:
+        messages: pd.DataFrame = pd.read_csv(Path(args.file), sep='\t', keep_default_na=False)
+        # NOTE: Keep empty texts as is, but messages without sender are saved with empty name,
+        #       turn it back to null like HtmlTelegramMessagesParser gives, so engines skip them.
+        messages['name'] = messages['name'].mask(messages['name'] == '')
+        pandas_manipulator = MessagesManipulator(messages, WordsStemmer())
+    else:
+        pandas_manipulator = AnalysisBundle.load(Path(args.bundle))
+
+    # NOTE: Reuse prepared messages to compare only stats calculation
+    arrow_manipulator = ArrowMessagesManipulator.from_prepared(pandas_manipulator.prepared_messages,
+                                                               pandas_manipulator.flatten_messages)
+    logger.info(f'Calculate stats for [{pandas_manipulator.prepared_messages.shape[0]}] messages '
+                f'([{pandas_manipulator.flatten_messages.shape[0]}] clean words).')
+
+    for name, get_stats in STATS.items():
+        pandas_time = benchmark(lambda: get_stats(pandas_manipulator), args.repeat)
+        arrow_time = benchmark(lambda: get_stats(arrow_manipulator), args.repeat)
+        logger.info(f'[{name}] pandas {pandas_time * 1000:.1f} ms, arrow {arrow_time * 1000:.1f} ms '
+                    f'(x{pandas_time / arrow_time:.1f}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -20,11 +20,16 @@ class FilesProvider:
         if not self.__raw_data_dir.is_dir():
             raise ValueError(f'Path [{self.__raw_data_dir}] does not exist or it is not a dir!')
 
-    def get_dest_file_path(self, additional_info: list[str]) -> Path:
+    def __get_dest_name(self, additional_info: list[str]) -> str:
         file_name = f'{self.__DESTINATION_DIR}/messages_' + '_'.join(additional_info)
-        truncated_file_name = (file_name[:100] + '..') if len(file_name) > 100 else file_name
-        
-        return Path(truncated_file_name + '.tsv')
+
+        return (file_name[:100] + '..') if len(file_name) > 100 else file_name
+
+    def get_dest_file_path(self, additional_info: list[str]) -> Path:
+        return Path(self.__get_dest_name(additional_info) + '.tsv')
+
+    def get_dest_bundle_dir_path(self, additional_info: list[str]) -> Path:
+        return Path(self.__get_dest_name(additional_info) + '.bundle')
 
     def get_all_raw_file_paths(self) -> list[Path]:
         file_paths = [Path(file_path) for file_path in
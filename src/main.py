@@ -7,16 +7,30 @@ from pathlib import Path
 import coloredlogs
 import pandas as pd
 
+from analysis_bundle import AnalysisBundle
+from arrow_messages_manipulator import ArrowMessagesManipulator
 from files_provider import FilesProvider
 from html_telegram_messages_parser import HtmlTelegramMessagesParser
 from message_stats_dash_server import MessageStatsDashServer
 from messages_manipulator import MessagesManipulator
+from words_stemmer import WordsStemmer
+
+MESSAGES_MANIPULATORS: dict[str, type[MessagesManipulator]] = {
+    'pandas': MessagesManipulator,
+    'arrow': ArrowMessagesManipulator,
+}
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description=f'[write-me] Write & analyze your Telegram messages')
     parser.add_argument('--log-level', type=str, choices=['debug', 'info', 'warning', 'error'],
                         default='debug', metavar='', help='debug/info/warning/error')
+    parser.add_argument('--engine', type=str, choices=list(MESSAGES_MANIPULATORS),
+                        default='pandas', metavar='', help='/'.join(MESSAGES_MANIPULATORS))
+    parser.add_argument('--stemmer', type=str, choices=WordsStemmer.BACKENDS,
+                        default='snowball', metavar='', help='/'.join(WordsStemmer.BACKENDS))
+    parser.add_argument('--stem-cache-size', type=int, default=WordsStemmer.DEFAULT_CACHE_SIZE,
+                        metavar='', help='max count of cached word stems')
     required_args = parser.add_argument_group('required arguments')
     required_args.add_argument('-p', '--pathdir', type=str, metavar='', help='dir with exported messages in .html',
                                required=True)
@@ -52,7 +66,17 @@ def main() -> None:
     logger.info(f'Save result to [{dest_file_path}].')
 
     try:
-        messages_manipulator = MessagesManipulator(messages)
+        words_stemmer = WordsStemmer(args.stemmer, args.stem_cache_size)
+        messages_manipulator = MESSAGES_MANIPULATORS[args.engine](messages, words_stemmer)
+
+        # NOTE: Bundle is only for self research, so do not stop the server if it can not be saved.
+        try:
+            dest_bundle_dir_path: Path = files_provider.get_dest_bundle_dir_path(senders)
+            AnalysisBundle.save(messages_manipulator, dest_bundle_dir_path)
+            logger.info(f'Save analysis bundle to [{dest_bundle_dir_path}].')
+        except Exception:
+            logger.exception('Could not save analysis bundle!')
+
         server = MessageStatsDashServer(logger, messages_manipulator)
         server.run()
     except Exception:
@@ -2,11 +2,11 @@ import nltk
 import numpy as np
 import pandas as pd
 from nltk.corpus import stopwords
-from nltk.stem.snowball import SnowballStemmer
 
 nltk.download('stopwords')
 
 from stop_words import RUSSIAN_STOP_WORDS, UKRAINIAN_STOP_WORDS
+from words_stemmer import WordsStemmer
 
 
 class MessagesManipulator:
@@ -14,10 +14,9 @@ class MessagesManipulator:
     Transform raw messages DataFrame and
     do some simple manipulations to get basic stats
     """
+    __STOP_WORDS = set(stopwords.words(['english', 'russian'])) | set(UKRAINIAN_STOP_WORDS) | set(RUSSIAN_STOP_WORDS)
 
-    @staticmethod
-    def __clean_up_words(words: list[str]) -> list[str]:
-        stemmer = SnowballStemmer('russian')
+    def __clean_up_words(self, words: list[str]) -> list[str]:
         clean_words = []
 
         for word in words:
@@ -25,10 +24,9 @@ class MessagesManipulator:
                 continue
             if word.startswith('http'):
                 continue
-            if word in stopwords.words(
-                    ['english', 'russian']) or word in UKRAINIAN_STOP_WORDS or word in RUSSIAN_STOP_WORDS:
+            if word in self.__STOP_WORDS:
                 continue
-            clean_words.append(stemmer.stem(word))
+            clean_words.append(self.words_stemmer.stem(word))
         return clean_words
 
     def __prepare_messages(self) -> pd.DataFrame:
@@ -80,8 +78,9 @@ class MessagesManipulator:
 
         return flatten_messages
 
-    def __init__(self, raw_messages: pd.DataFrame) -> None:
+    def __init__(self, raw_messages: pd.DataFrame, words_stemmer: WordsStemmer | None = None) -> None:
         self.raw_messages = raw_messages
+        self.words_stemmer = WordsStemmer() if words_stemmer is None else words_stemmer
 
         expected_columns = ['date', 'name', 'text']
         if not set(expected_columns).issubset(raw_messages.columns):
@@ -92,6 +91,26 @@ class MessagesManipulator:
         self.prepared_messages = self.__prepare_messages()
         self.flatten_messages = self.__get_flatten_messages()
 
+    @classmethod
+    def from_prepared(cls,
+                      prepared_messages: pd.DataFrame,
+                      flatten_messages: pd.DataFrame) -> 'MessagesManipulator':
+        """
+        Create manipulator from already prepared & flatten messages
+        (e.g. loaded from AnalysisBundle) without cleaning words again.
+
+        NOTE: Such manipulator has no raw messages & words stemmer (they are None),
+              so it can not be saved to AnalysisBundle again. Its prepared messages have
+              only cols which were given (AnalysisBundle gives no [time, message, words, clean_words]).
+        """
+        messages_manipulator = cls.__new__(cls)
+        messages_manipulator.raw_messages = None
+        messages_manipulator.words_stemmer = None
+        messages_manipulator.prepared_messages = prepared_messages
+        messages_manipulator.flatten_messages = flatten_messages
+
+        return messages_manipulator
+
     def get_popular_words(self, n: int) -> pd.DataFrame:
         """
         Return DataFrame with sorted words frequency like
@@ -104,10 +123,11 @@ class MessagesManipulator:
         4 |T    | beer    | 1
         (here n=2)
         """
-        popular_words = self.flatten_messages.groupby(['user'])['clean_words'] \
+        popular_words = self.flatten_messages.groupby(['user'], observed=True)['clean_words'] \
             .agg(count='value_counts') \
             .reset_index() \
-            .groupby(['user']) \
+            .query('count > 0') \
+            .groupby(['user'], observed=True) \
             .head(n) \
             .reset_index(drop=True) \
             .rename(columns={'clean_words': 'word'})
@@ -115,9 +135,9 @@ class MessagesManipulator:
         return popular_words
 
     def get_message_count(self) -> pd.DataFrame:
-        return self.prepared_messages.groupby('user')['message'] \
-            .agg(count='count') \
-            .reset_index()
+        return self.prepared_messages.groupby('user', observed=True) \
+            .size() \
+            .reset_index(name='count')
 
     def get_mean_message_len(self) -> pd.DataFrame:
         """
@@ -125,10 +145,10 @@ class MessagesManipulator:
         shows how many informative words in average in message
         """
 
-        res = self.flatten_messages.groupby(['index', 'user'])['clean_words'] \
+        res = self.flatten_messages.groupby(['index', 'user'], observed=True)['clean_words'] \
             .agg(words_count='count') \
             .reset_index() \
-            .groupby(['user'])['words_count'] \
+            .groupby(['user'], observed=True)['words_count'] \
             .agg(words_in_avg_by_message='mean') \
             .reset_index()
         res['count'] = res.words_in_avg_by_message.apply(np.ceil)  # round to upper
@@ -140,10 +160,10 @@ class MessagesManipulator:
     #       So the resulting data may be speculative.
 
     def get_mean_per_active_day(self) -> pd.DataFrame:
-        res = self.prepared_messages.groupby(['user', 'date'])['message'] \
-            .agg(messages_count='count') \
-            .reset_index() \
-            .groupby(['user'])['messages_count'] \
+        res = self.prepared_messages.groupby(['user', 'date'], observed=True) \
+            .size() \
+            .reset_index(name='messages_count') \
+            .groupby(['user'], observed=True)['messages_count'] \
             .agg(messages_in_avg_per_day='mean') \
             .reset_index()
         res['count'] = res.messages_in_avg_per_day.apply(np.ceil)  # round to upper
@@ -151,15 +171,15 @@ class MessagesManipulator:
         return res
 
     def get_total_per_active_day(self) -> pd.DataFrame:
-        return self.prepared_messages.groupby(['user', 'date'])['message'] \
-            .agg(messages_count='count') \
-            .reset_index()
+        return self.prepared_messages.groupby(['user', 'date'], observed=True) \
+            .size() \
+            .reset_index(name='messages_count')
 
     def get_mean_per_active_month(self) -> pd.DataFrame:
-        res = self.prepared_messages.groupby(['user', 'month', 'year'])['message'] \
-            .agg(messages_count='count') \
-            .reset_index() \
-            .groupby(['user', 'year'])['messages_count'] \
+        res = self.prepared_messages.groupby(['user', 'month', 'year'], observed=True) \
+            .size() \
+            .reset_index(name='messages_count') \
+            .groupby(['user', 'year'], observed=True)['messages_count'] \
             .agg(messages_in_avg_per_month='mean') \
             .reset_index()
         res['count'] = res.messages_in_avg_per_month.apply(np.ceil)  # round to upper
@@ -167,10 +187,10 @@ class MessagesManipulator:
         return res
 
     def get_mean_per_active_year(self) -> pd.DataFrame:
-        res = self.prepared_messages.groupby(['user', 'year'])['message'] \
-            .agg(messages_count='count') \
-            .reset_index() \
-            .groupby(['user'])['messages_count'] \
+        res = self.prepared_messages.groupby(['user', 'year'], observed=True) \
+            .size() \
+            .reset_index(name='messages_count') \
+            .groupby(['user'], observed=True)['messages_count'] \
             .agg(messages_in_avg_per_year='mean') \
             .reset_index()
         res['count'] = res.messages_in_avg_per_year.apply(np.ceil)  # round to upper
@@ -178,10 +198,10 @@ class MessagesManipulator:
         return res
 
     def get_active_months_per_active_year(self, n: int) -> pd.DataFrame:
-        return self.prepared_messages.groupby(['user', 'month', 'year'])['message'] \
-            .agg(messages_count='count') \
-            .reset_index() \
+        return self.prepared_messages.groupby(['user', 'month', 'year'], observed=True) \
+            .size() \
+            .reset_index(name='messages_count') \
             .sort_values(['messages_count'], ascending=False) \
-            .groupby(['user', 'year']) \
+            .groupby(['user', 'year'], observed=True) \
             .head(n) \
             .reset_index(drop=True)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import time
+from itertools import chain
+from pathlib import Path
+
+import coloredlogs
+import pandas as pd
+
+from messages_manipulator import MessagesManipulator
+from words_stemmer import WordsStemmer
+
+
+def benchmark(words: list[str], words_stemmer: WordsStemmer) -> float:
+    """Return tokens/sec"""
+    start = time.perf_counter()
+    for word in words:
+        words_stemmer.stem(word)
+
+    return len(words) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=f'[write-me] Compare speed of words stemmer backends')
+    parser.add_argument('--stem-cache-size', type=int, default=WordsStemmer.DEFAULT_CACHE_SIZE,
+                        metavar='', help='max count of cached word stems')
+    required_args = parser.add_argument_group('required arguments')
+    required_args.add_argument('-f', '--file', type=str, metavar='', help='.tsv with messages saved by main.py',
+                               required=True)
+
+    args = parser.parse_args()
+
+    coloredlogs.install(logging.INFO)
+    logger = logging.getLogger("[write-me]")
+
+    messages: pd.DataFrame = pd.read_csv(Path(args.file), sep='\t', keep_default_na=False)
+    # NOTE: Take words after the same clean up as for stats, but not stemmed yet
+    not_stemmed_messages = MessagesManipulator(messages, WordsStemmer('none')).prepared_messages
+    words: list[str] = list(chain.from_iterable(not_stemmed_messages.clean_words))
+    logger.info(f'Stem [{len(words)}] tokens ([{len(set(words))}] unique).')
+
+    for backend in WordsStemmer.BACKENDS:
+        no_cache_speed = benchmark(words, WordsStemmer(backend, cache_size=0))
+
+        words_stemmer = WordsStemmer(backend, args.stem_cache_size)
+        cache_speed = benchmark(words, words_stemmer)
+        cache_info = words_stemmer.stem.cache_info()
+
+        logger.info(f'[{backend}] {no_cache_speed:,.0f} tokens/sec without cache, '
+                    f'{cache_speed:,.0f} tokens/sec with cache '
+                    f'(hits={cache_info.hits}, misses={cache_info.misses}).')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import re
+from enum import Enum
+from functools import lru_cache
+from typing import Callable
+
+from nltk.stem.snowball import SnowballStemmer
+
+
+class Language(Enum):
+    RUSSIAN = 'russian'
+    UKRAINIAN = 'ukrainian'
+    ENGLISH = 'english'
+
+
+class UkrainianStemmer:
+    """
+    Light suffix stripping stemmer for Ukrainian words.
+    NLTK does not have Ukrainian snowball stemmer and the Russian one breaks words with [і, ї, є, ґ]
+    """
+    __RV = re.compile(r'^(.*?[аеиоуюяіїє])(.*)$')
+    __PERFECTIVE_GERUND = re.compile(r'(ившись|ивши|вшись|вши)$')
+    __REFLEXIVE = re.compile(r'(ся|сь)$')
+    __ADJECTIVE = re.compile(r'(ими|іми|ого|ому|ої|ою|ий|ій|им|ім|их|іх)$')
+    __VERB = re.compile(r'(ати|яти|ити|іти|ють|ать|ять|ить|іть|уть|ла|ло|ли|ав|ив|ме|те|ть)$')
+    __NOUN = re.compile(r'(ами|ями|ові|еві|єві|ах|ях|ів|їв|ей|ом|ем|єм|ою|ею|єю|ам|ям|а|я|о|е|є|и|і|ї|у|ю|й)$')
+    __SOFT_SIGN = re.compile(r'ь$')
+
+    def stem(self, word: str) -> str:
+        match = self.__RV.match(word)
+        if match is None:
+            return word
+
+        start, rv = match.groups()
+        rv, count = self.__PERFECTIVE_GERUND.subn('', rv)
+        if count == 0:
+            rv = self.__REFLEXIVE.sub('', rv)
+            for suffix in [self.__ADJECTIVE, self.__VERB, self.__NOUN]:
+                rv, count = suffix.subn('', rv)
+                if count:
+                    break
+
+        return start + self.__SOFT_SIGN.sub('', rv)
+
+
+class WordsStemmer:
+    """
+    Stem words with a stemmer chosen by word language.
+    Language is detected by characters: Latin -> English,
+    Cyrillic with [і, ї, є, ґ] -> Ukrainian, other Cyrillic -> Russian.
+    Words without Latin or Cyrillic characters (numbers etc.) stay as is.
+    Stems of all languages are kept in one LRU cache
+
+    Backends:
+    snowball - ru & en snowball stemmers, light Ukrainian stemmer for uk
+    russian  - Russian snowball stemmer for all words (previous behaviour, poor en & uk stems)
+    none     - do not stem words at all (the fastest)
+    """
+    BACKENDS = ['snowball', 'russian', 'none']
+    DEFAULT_CACHE_SIZE = 2 ** 16
+
+    __LATIN = re.compile(r'[a-z]')
+    __UKRAINIAN = re.compile(r'[іїєґ]')
+    __CYRILLIC = re.compile(r'[а-яё]')
+
+    def __init__(self, backend: str = 'snowball', cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Unknown stemmer [backend={backend}], expected one of [{self.BACKENDS}]!')
+
+        self.backend = backend
+        self.__stemmers = self.__get_stemmers(backend)
+        self.stem = lru_cache(maxsize=cache_size)(self.__stem)
+
+    @staticmethod
+    def __get_stemmers(backend: str) -> dict[Language, Callable[[str], str]]:
+        if backend == 'snowball':
+            return {
+                Language.RUSSIAN: SnowballStemmer('russian').stem,
+                Language.UKRAINIAN: UkrainianStemmer().stem,
+                Language.ENGLISH: SnowballStemmer('english').stem,
+            }
+        if backend == 'russian':
+            russian_stemmer = SnowballStemmer('russian')
+            return {language: russian_stemmer.stem for language in Language}
+
+        return {}
+
+    @staticmethod
+    def detect_language(word: str) -> Language | None:
+        if WordsStemmer.__LATIN.search(word):
+            return Language.ENGLISH
+        if WordsStemmer.__UKRAINIAN.search(word):
+            return Language.UKRAINIAN
+        if WordsStemmer.__CYRILLIC.search(word):
+            return Language.RUSSIAN
+
+        return None
+
+    def __stem(self, word: str) -> str:
+        stemmer = self.__stemmers.get(self.detect_language(word))
+
+        return word if stemmer is None else stemmer(word)
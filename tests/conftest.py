@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# NOTE: Modules in src/ import each other as top-level modules (like main.py does)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
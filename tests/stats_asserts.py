@@ -0,0 +1,35 @@
+import pandas as pd
+
+
+def to_objects(df: pd.DataFrame) -> pd.DataFrame:
+    """Categories order of pandas results depends on the groupby path, so compare categorical values"""
+    return df.astype({column: object for column in df.select_dtypes('category').columns})
+
+
+def assert_same_stats(expected: pd.DataFrame, actual: pd.DataFrame) -> None:
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.dtypes.equals(expected.dtypes)
+
+    columns = list(expected.columns)
+    pd.testing.assert_frame_equal(to_objects(actual).sort_values(columns).reset_index(drop=True),
+                                  to_objects(expected).sort_values(columns).reset_index(drop=True))
+
+
+def assert_same_top(expected: pd.DataFrame,
+                    actual: pd.DataFrame,
+                    all_rows: pd.DataFrame,
+                    by: list[str],
+                    count_column: str) -> None:
+    """Rows with equal counts can be kept in any order, so compare only counts of every group"""
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.dtypes.equals(expected.dtypes)
+
+    def get_counts(df: pd.DataFrame) -> dict:
+        return to_objects(df).groupby(by)[count_column].apply(sorted).to_dict()
+
+    assert get_counts(actual) == get_counts(expected)
+
+    # every kept row must be a real row of not truncated stats
+    columns = list(expected.columns)
+    assert to_objects(actual).merge(to_objects(all_rows), on=columns, how='left', indicator=True)['_merge'] \
+        .eq('both').all()
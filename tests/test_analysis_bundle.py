@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis_bundle import AnalysisBundle
+from arrow_messages_manipulator import ArrowMessagesManipulator
+from messages_manipulator import MessagesManipulator
+from stats_asserts import assert_same_stats, assert_same_top, to_objects
+from words_stemmer import WordsStemmer
+
+ALL_ROWS = 10 ** 9
+
+# NOTE: Telegram exports dates with UTC offset, messages close to midnight
+#       must keep their local day, month & year after the bundle round trip.
+RAW_MESSAGES = [
+    ('01.01.2021 23:30:00 UTC+03:00', 'A', 'кофе, кофе и чай'),
+    ('01.01.2021 00:30:00 UTC+03:00', 'T', 'чай или виски?'),
+    ('31.01.2021 23:59:00 UTC+03:00', 'A', 'чай & coffee'),
+    ('20.02.2021 09:00:00 UTC+03:00', None, 'кофе кофе кофе'),
+    ('31.12.2021 23:45:00 UTC+03:00', 'T', 'виски, кофе'),
+    ('01.01.2022 00:15:00 UTC+03:00', 'A', 'и'),
+]
+
+
+def get_raw_messages() -> pd.DataFrame:
+    return pd.DataFrame(RAW_MESSAGES, columns=['date', 'name', 'text'])
+
+
+@pytest.fixture
+def bundle_dir(tmp_path: Path) -> Path:
+    bundle_dir = tmp_path / 'messages.bundle'
+    AnalysisBundle.save(MessagesManipulator(get_raw_messages()), bundle_dir)
+
+    return bundle_dir
+
+
+@pytest.mark.parametrize('messages_manipulator_class', [MessagesManipulator, ArrowMessagesManipulator])
+@pytest.mark.parametrize('get_stats', [
+    MessagesManipulator.get_message_count,
+    MessagesManipulator.get_mean_message_len,
+    MessagesManipulator.get_mean_per_active_day,
+    MessagesManipulator.get_total_per_active_day,
+    MessagesManipulator.get_mean_per_active_month,
+    MessagesManipulator.get_mean_per_active_year,
+])
+def test_load_gives_same_stats(bundle_dir: Path,
+                               messages_manipulator_class: type[MessagesManipulator],
+                               get_stats) -> None:
+    expected = get_stats(MessagesManipulator(get_raw_messages()))
+    actual = getattr(AnalysisBundle.load(bundle_dir, messages_manipulator_class), get_stats.__name__)()
+
+    assert_same_stats(to_objects(expected), to_objects(actual))
+
+
+@pytest.mark.parametrize('messages_manipulator_class', [MessagesManipulator, ArrowMessagesManipulator])
+@pytest.mark.parametrize('n', [1, ALL_ROWS])
+def test_load_gives_same_top_stats(bundle_dir: Path,
+                                   messages_manipulator_class: type[MessagesManipulator],
+                                   n: int) -> None:
+    expected_manipulator = MessagesManipulator(get_raw_messages())
+    actual_manipulator = AnalysisBundle.load(bundle_dir, messages_manipulator_class)
+
+    assert_same_top(to_objects(expected_manipulator.get_popular_words(n)),
+                    to_objects(actual_manipulator.get_popular_words(n)),
+                    expected_manipulator.get_popular_words(ALL_ROWS),
+                    by=['user'],
+                    count_column='count')
+    assert_same_top(expected_manipulator.get_active_months_per_active_year(n),
+                    to_objects(actual_manipulator.get_active_months_per_active_year(n)),
+                    expected_manipulator.get_active_months_per_active_year(ALL_ROWS),
+                    by=['user', 'year'],
+                    count_column='messages_count')
+
+
+def test_open_arrays(tmp_path: Path) -> None:
+    raw_messages = pd.DataFrame([
+        ('01.01.2021 23:30:00 UTC+03:00', 'A', 'кофе чай'),
+        ('02.01.2021 10:00:00 UTC+03:00', 'T', 'и'),
+        ('03.01.2021 10:00:00 UTC+03:00', 'A', 'чай'),
+    ], columns=['date', 'name', 'text'])
+    bundle_dir = tmp_path / 'messages.bundle'
+    AnalysisBundle.save(MessagesManipulator(raw_messages, WordsStemmer('none')), bundle_dir)
+
+    arrays = AnalysisBundle.open_arrays(bundle_dir)
+    assert all(isinstance(array, np.memmap) for array in arrays.values())
+    assert AnalysisBundle.open_vocab(bundle_dir) == ['кофе', 'чай']
+    assert AnalysisBundle.open_users(bundle_dir) == ['A', 'T']
+    assert arrays['token_ids'].dtype == np.int32
+    assert arrays['token_ids'].tolist() == [0, 1, 1]
+    assert arrays['token_offsets'].tolist() == [0, 2, 2, 3]
+    assert arrays['user_codes'].tolist() == [0, 1, 0]
+    assert arrays['timestamps'].view('datetime64[ns]').tolist() == \
+        pd.to_datetime(['2021-01-01 23:30', '2021-01-02 10:00', '2021-01-03 10:00']).to_numpy().tolist()
+
+
+@pytest.mark.parametrize('messages_manipulator_class', [MessagesManipulator, ArrowMessagesManipulator])
+def test_load_without_clean_words(tmp_path: Path, messages_manipulator_class: type[MessagesManipulator]) -> None:
+    raw_messages = pd.DataFrame([('01.01.2021 10:00:00 UTC+03:00', 'A', 'и')], columns=['date', 'name', 'text'])
+    bundle_dir = tmp_path / 'messages.bundle'
+    AnalysisBundle.save(MessagesManipulator(raw_messages.copy()), bundle_dir)
+
+    assert AnalysisBundle.open_vocab(bundle_dir) == []
+    assert AnalysisBundle.open_arrays(bundle_dir)['token_offsets'].tolist() == [0, 0]
+
+    expected_manipulator = MessagesManipulator(raw_messages.copy())
+    actual_manipulator = AnalysisBundle.load(bundle_dir, messages_manipulator_class)
+    for get_stats in [
+        lambda m: m.get_popular_words(10),
+        lambda m: m.get_message_count(),
+        lambda m: m.get_mean_message_len(),
+        lambda m: m.get_total_per_active_day(),
+        lambda m: m.get_active_months_per_active_year(10),
+    ]:
+        expected, actual = get_stats(expected_manipulator), get_stats(actual_manipulator)
+        assert list(actual.columns) == list(expected.columns)
+        assert to_objects(actual).values.tolist() == to_objects(expected).values.tolist()
+
+
+def test_save_replaces_previous_bundle(tmp_path: Path, bundle_dir: Path) -> None:
+    (bundle_dir / 'stale.npy').touch()
+
+    AnalysisBundle.save(MessagesManipulator(get_raw_messages()), bundle_dir)
+
+    assert not (bundle_dir / 'stale.npy').exists()
+    assert [path.name for path in tmp_path.iterdir()] == [bundle_dir.name]
+
+
+def test_failed_save_keeps_previous_bundle(tmp_path: Path, bundle_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*args, **kwargs) -> None:
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr('analysis_bundle.json.dump', fail)
+    with pytest.raises(OSError):
+        AnalysisBundle.save(MessagesManipulator(get_raw_messages()), bundle_dir)
+    monkeypatch.undo()
+
+    assert [path.name for path in tmp_path.iterdir()] == [bundle_dir.name]
+    assert to_objects(AnalysisBundle.load(bundle_dir).get_message_count()).to_dict('records') == \
+        [{'user': 'A', 'count': 3}, {'user': 'T', 'count': 2}]
+
+
+def test_failed_rename_restores_previous_bundle(tmp_path: Path,
+                                                bundle_dir: Path,
+                                                monkeypatch: pytest.MonkeyPatch) -> None:
+    rename = Path.rename
+
+    def rename_new_bundle_fails(path: Path, target: Path) -> Path:
+        if target == bundle_dir and not path.name.endswith('.old'):
+            raise OSError('Permission denied')
+        return rename(path, target)
+
+    monkeypatch.setattr(Path, 'rename', rename_new_bundle_fails)
+    with pytest.raises(OSError):
+        AnalysisBundle.save(MessagesManipulator(get_raw_messages()), bundle_dir)
+    monkeypatch.undo()
+
+    assert [path.name for path in tmp_path.iterdir()] == [bundle_dir.name]
+    assert AnalysisBundle.open_users(bundle_dir) == ['A', 'T']
+
+
+def test_save_loaded_bundle(tmp_path: Path, bundle_dir: Path) -> None:
+    with pytest.raises(ValueError, match='from_prepared'):
+        AnalysisBundle.save(AnalysisBundle.load(bundle_dir), tmp_path / 'copy.bundle')
+
+    assert not (tmp_path / 'copy.bundle').exists()
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from analysis_bundle import AnalysisBundle
+from arrow_messages_manipulator import ArrowMessagesManipulator
+from messages_manipulator import MessagesManipulator
+from stats_asserts import assert_same_stats, assert_same_top, to_objects
+
+ALL_ROWS = 10 ** 9
+
+# NOTE: Top 2 words of A and top 1 month of T in 2022 have ties,
+#       the message without user must be skipped by both engines.
+RAW_MESSAGES = [
+    ('01.01.2021 10:00:00', 'A', 'кофе, кофе и чай'),
+    ('01.01.2021 11:00:00', 'T', 'чай или виски?'),
+    ('02.01.2021 12:00:00', 'A', 'чай & coffee'),
+    ('15.02.2021 09:00:00', 'T', 'виски, кофе'),
+    ('20.02.2021 09:00:00', None, 'кофе кофе кофе'),
+    ('03.03.2022 09:00:00', 'A', 'coffee or tea'),
+    ('04.03.2022 09:00:00', 'T', 'кішкою'),
+    ('05.04.2022 09:00:00', 'T', 'кофе'),
+    ('06.04.2022 09:00:00', 'A', 'и'),
+]
+
+
+def get_raw_messages() -> pd.DataFrame:
+    return pd.DataFrame(RAW_MESSAGES, columns=['date', 'name', 'text'])
+
+
+@pytest.fixture(params=['raw', 'bundle'])
+def manipulators(request: pytest.FixtureRequest, tmp_path: Path) -> tuple[MessagesManipulator, MessagesManipulator]:
+    if request.param == 'raw':
+        return MessagesManipulator(get_raw_messages()), ArrowMessagesManipulator(get_raw_messages())
+
+    bundle_dir = tmp_path / 'messages.bundle'
+    AnalysisBundle.save(MessagesManipulator(get_raw_messages()), bundle_dir)
+    return AnalysisBundle.load(bundle_dir), AnalysisBundle.load(bundle_dir, ArrowMessagesManipulator)
+
+
+@pytest.mark.parametrize('get_stats', [
+    MessagesManipulator.get_message_count,
+    MessagesManipulator.get_mean_message_len,
+    MessagesManipulator.get_mean_per_active_day,
+    MessagesManipulator.get_total_per_active_day,
+    MessagesManipulator.get_mean_per_active_month,
+    MessagesManipulator.get_mean_per_active_year,
+])
+def test_stats(manipulators: tuple[MessagesManipulator, MessagesManipulator], get_stats) -> None:
+    pandas_manipulator, arrow_manipulator = manipulators
+
+    assert_same_stats(get_stats(pandas_manipulator), getattr(arrow_manipulator, get_stats.__name__)())
+
+
+@pytest.mark.parametrize('n', [1, 2, ALL_ROWS])
+def test_popular_words(manipulators: tuple[MessagesManipulator, MessagesManipulator], n: int) -> None:
+    pandas_manipulator, arrow_manipulator = manipulators
+
+    assert_same_top(pandas_manipulator.get_popular_words(n),
+                    arrow_manipulator.get_popular_words(n),
+                    pandas_manipulator.get_popular_words(ALL_ROWS),
+                    by=['user'],
+                    count_column='count')
+
+
+@pytest.mark.parametrize('n', [1, 2, ALL_ROWS])
+def test_active_months_per_active_year(manipulators: tuple[MessagesManipulator, MessagesManipulator], n: int) -> None:
+    pandas_manipulator, arrow_manipulator = manipulators
+
+    assert_same_top(pandas_manipulator.get_active_months_per_active_year(n),
+                    arrow_manipulator.get_active_months_per_active_year(n),
+                    pandas_manipulator.get_active_months_per_active_year(ALL_ROWS),
+                    by=['user', 'year'],
+                    count_column='messages_count')
+
+
+def test_messages_without_user_are_skipped(manipulators: tuple[MessagesManipulator, MessagesManipulator]) -> None:
+    _, arrow_manipulator = manipulators
+
+    message_count = to_objects(arrow_manipulator.get_message_count())
+    assert message_count.to_dict('records') == [{'user': 'A', 'count': 4}, {'user': 'T', 'count': 4}]
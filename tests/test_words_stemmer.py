@@ -0,0 +1,65 @@
+import pytest
+
+from words_stemmer import Language, UkrainianStemmer, WordsStemmer
+
+
+@pytest.mark.parametrize('word, language', [
+    ('coffee', Language.ENGLISH),
+    ('кофеcoffee', Language.ENGLISH),
+    ('кішка', Language.UKRAINIAN),
+    ('їжа', Language.UKRAINIAN),
+    ('єдиний', Language.UKRAINIAN),
+    ('ґанок', Language.UKRAINIAN),
+    ('кофе', Language.RUSSIAN),
+    ('ёлка', Language.RUSSIAN),
+    ('2022', None),
+])
+def test_detect_language(word: str, language: Language | None) -> None:
+    assert WordsStemmer.detect_language(word) == language
+
+
+@pytest.mark.parametrize('word, stem', [
+    ('кішкою', 'кішк'),
+    ('українського', 'українськ'),
+    ('книжками', 'книжк'),
+    ('зробивши', 'зроб'),
+    ('вчитися', 'вчит'),
+    ('дівчата', 'дівчат'),
+])
+def test_ukrainian_stemmer(word: str, stem: str) -> None:
+    assert UkrainianStemmer().stem(word) == stem
+
+
+@pytest.mark.parametrize('backend, word, stem', [
+    ('snowball', 'running', 'run'),
+    ('snowball', 'кішкою', 'кішк'),
+    ('snowball', 'хочешь', 'хочеш'),
+    ('snowball', '2022', '2022'),
+    ('russian', 'хочешь', 'хочеш'),
+    ('russian', 'running', 'running'),
+    ('none', 'хочешь', 'хочешь'),
+])
+def test_stem(backend: str, word: str, stem: str) -> None:
+    assert WordsStemmer(backend).stem(word) == stem
+
+
+def test_stem_without_cache() -> None:
+    words_stemmer = WordsStemmer(cache_size=0)
+
+    assert words_stemmer.stem('running') == 'run'
+    assert words_stemmer.stem('running') == 'run'
+    assert words_stemmer.stem.cache_info().currsize == 0
+
+
+def test_stem_cache_is_shared_by_languages() -> None:
+    words_stemmer = WordsStemmer()
+    for word in ['running', 'кішкою', 'хочешь', 'running', 'кішкою', 'хочешь']:
+        words_stemmer.stem(word)
+
+    cache_info = words_stemmer.stem.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (3, 3)
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        WordsStemmer('porter')